@@ -3,11 +3,17 @@ Ultra-fast demo for competition
 """
 import sys
 from pathlib import Path
+import asyncio
 import gradio as gr
 import json
 from PIL import Image
 import time
 
+try:
+    import orjson  # SIMD-accelerated C serializer
+except ImportError:
+    orjson = None
+
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from models.qwen_client import Qwen3VLClient
@@ -34,16 +40,18 @@ def process_file(file, progress=gr.Progress()):
         
         file_path = Path(file.name)
         
-        # Load
+        # Load - PDFs stream page-by-page so inference overlaps rendering
         if file_path.suffix.lower() == '.pdf':
-            images, _ = doc_utils.process_document(file_path)
+            total_pages = doc_utils.pdf_page_count(file_path)
+            images = doc_utils.iter_pdf_pages(file_path)
         else:
+            total_pages = 1
             images = [doc_utils.load_image(file_path)]
-        
+
         progress(0.3, desc="Processing with AI...")
-        
-        # Process
-        result = processor.process_document(images)
+
+        # Process - pages dispatched concurrently
+        result = asyncio.run(processor.aprocess_document(images, total_pages=total_pages))
         
         progress(1.0, desc="Done!")
         elapsed = time.time() - start
@@ -55,7 +63,11 @@ def process_file(file, progress=gr.Progress()):
         
         status = f"✅ **{pages} page(s)** processed in **{elapsed:.1f}s** | Type: **{doc_type.upper()}**"
         
-        extracted = json.dumps(result.get('extracted_content', {}), indent=2)
+        content = result.get('extracted_content', {})
+        if orjson:
+            extracted = orjson.dumps(content, option=orjson.OPT_INDENT_2).decode()
+        else:
+            extracted = json.dumps(content, indent=2)
         
         return status, extracted, confidence, elapsed
         
@@ -1,71 +1,284 @@
 """
 Ultra-fast processor for competition demo
 Prioritizes speed over detail
+
+One implementation serves both modes: the default schema/token budget
+is the fast demo configuration, and simple_processor builds the
+detailed-extraction variant from the same class.
 """
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional
 from PIL import Image
+import asyncio
+import functools
+import hashlib
+import itertools
 import json
 import re
 import logging
 
+try:
+    import orjson  # SIMD-accelerated C parser
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Per-page JSON schemas shown to the model
+FAST_SCHEMA = """{
+  "type": "invoice/receipt/form/table/report/letter/other",
+  "confidence": 0.9,
+  "main_content": "brief summary",
+  "key_data": {"field": "value"},
+  "amounts": {"total": ""},
+  "dates": [""]
+}"""
+
+DETAILED_SCHEMA = """{
+  "type": "invoice/receipt/form/table/report/research_paper/letter/other",
+  "confidence": 0.9,
+  "main_content": "all readable text",
+  "key_data": {"field": "value"},
+  "tables": [{"description": "table description", "data": []}],
+  "amounts": {"subtotal": "", "tax": "", "total": ""},
+  "dates": [""],
+  "important_info": [""]
+}"""
+
+
+def _loads(s: str) -> Any:
+    """Parse JSON with orjson when available, stdlib otherwise"""
+    return orjson.loads(s) if orjson else json.loads(s)
+
+# Precompiled once - avoids per-call pattern cache lookups
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+_FENCE_RE = re.compile(r'```json\s*|\s*```')
+_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+
+def _find_json(s: str) -> Optional[str]:
+    """Find the first balanced {...} block with a single linear scan
+
+    Deterministic O(n) replacement for the old nested-brace regex,
+    which backtracked badly on long or malformed model output.
+    Tracks string/escape state so braces inside values don't count.
+    """
+    start = s.find('{')
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+
+    for i in range(start, len(s)):
+        c = s[i]
+        if escape:
+            escape = False
+        elif c == '\\':
+            escape = True
+        elif c == '"':
+            in_string = not in_string
+        elif not in_string:
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+                if depth == 0:
+                    return s[start:i + 1]
+
+    return None
+
 
 class FastDocumentProcessor:
-    """Lightning-fast processor for demos"""
-    
-    def __init__(self, qwen_client):
+    """Lightning-fast processor for demos
+
+    Parameterized by schema, token budget, and page cap so one code
+    path serves both the fast and the detailed configuration.
+    """
+
+    _CACHE_SIZE = 128
+
+    def __init__(
+        self,
+        qwen_client,
+        schema: str = FAST_SCHEMA,
+        max_tokens: int = 500,
+        max_pages: Optional[int] = 3,
+        adaptive_tokens: bool = True
+    ):
         self.qwen_client = qwen_client
+        self.schema = schema
+        self.max_tokens = max_tokens
+        self.max_pages = max_pages  # None = process every page
+        # Try a tight token budget first and retry on truncation -
+        # right for terse fast-mode replies, wrong for schemas that
+        # ask for full page text (the retry would fire every time)
+        self.adaptive_tokens = adaptive_tokens
+        # Prompts are built once: a byte-identical prompt across calls
+        # skips per-call string formatting and lets the server reuse
+        # the prefilled KV cache for the shared prefix
+        self._page_prompt = f"""Analyze this document. Return JSON only:
+
+{schema}
+
+Be concise. JSON only, no explanation."""
+        self._batch_prompts: Dict[int, str] = {}
+        # Page-level memoization: digest of raw pixels -> extraction.
+        # Demo workflows re-upload the same files; a blake2b over the
+        # pixel buffer is trivial next to a VLM forward pass.
+        self._cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
         logger.info("⚡ Initialized Fast Document Processor")
+
+    @staticmethod
+    def _page_key(image: Image.Image) -> bytes:
+        return hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return dict(cached)
+        return None
+
+    def _cache_put(self, key: bytes, extraction: Dict[str, Any]) -> None:
+        self._cache[key] = dict(extraction)
+        if len(self._cache) > self._CACHE_SIZE:
+            self._cache.popitem(last=False)
     
-    def process_document(self, images: List[Image.Image]) -> Dict[str, Any]:
-        """Process document FAST"""
-        
-        logger.info(f"⚡ Fast processing {len(images)} page(s)")
-        
-        # Process only first page for speed (or limit to 3 pages max)
-        pages_to_process = images[:min(3, len(images))]
-        
-        extractions = []
-        for i, image in enumerate(pages_to_process, 1):
-            logger.info(f"📄 Page {i}...")
-            extraction = self._extract_page_fast(image, i)
-            extractions.append(extraction)
-        
+    def process_document(
+        self,
+        images: Iterable[Image.Image],
+        total_pages: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Process document FAST
+
+        Accepts a list or a lazy page iterator (see
+        DocumentProcessor.iter_pdf_pages). Pass total_pages when the
+        iterator's length isn't known up front.
+        """
+
+        # Process only the first max_pages pages for speed
+        pages_to_process = list(itertools.islice(iter(images), self.max_pages))
+        total = self._total_pages(images, total_pages, len(pages_to_process))
+
+        logger.info(f"⚡ Fast processing {len(pages_to_process)}/{total} page(s)")
+
+        # Single multi-image request - one round-trip for all pages
+        extractions = self._extract_pages_batched(pages_to_process)
+
         # Simple combination
-        result = self._combine_simple(extractions, len(images))
-        
+        result = self._combine_simple(extractions, total)
+
         logger.info(f"✅ Done - Confidence: {result['confidence']:.2f}")
         return result
-    
-    def _extract_page_fast(self, image: Image.Image, page_num: int) -> Dict[str, Any]:
-        """Fast extraction with short prompt"""
-        
-        # Ultra-concise prompt
-        prompt = f"""Analyze this document. Return JSON only:
 
-{{
-  "type": "invoice/receipt/form/table/report/letter/other",
-  "confidence": 0.9,
-  "main_content": "brief summary",
-  "key_data": {{"field": "value"}},
-  "amounts": {{"total": ""}},
-  "dates": [""]
-}}
+    async def aprocess_document(
+        self,
+        images: Iterable[Image.Image],
+        total_pages: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Process document FAST with concurrent per-page requests
 
-Be concise. JSON only, no explanation."""
+        Alternative to the single batched request when the server
+        handles separate in-flight requests better than one big one.
+        With a lazy page iterator, each request launches the moment its
+        page finishes rasterizing - inference overlaps rendering.
+        """
+
+        loop = asyncio.get_running_loop()
+        it = iter(images)
+
+        tasks = []
+        page_num = 0
+        while self.max_pages is None or page_num < self.max_pages:
+            # Pull the next page off the main thread so rasterization
+            # doesn't block already-launched requests
+            image = await loop.run_in_executor(None, next, it, None)
+            if image is None:
+                break
+            page_num += 1
+            logger.info(f"📄 Page {page_num} ready, dispatching...")
+            tasks.append(asyncio.ensure_future(
+                self._aextract_page_fast(image, page_num)
+            ))
+
+        extractions = await asyncio.gather(*tasks)
+        total = self._total_pages(images, total_pages, page_num)
+
+        result = self._combine_simple(list(extractions), total)
+
+        logger.info(f"✅ Done - Confidence: {result['confidence']:.2f}")
+        return result
+
+    @staticmethod
+    def _total_pages(
+        images: Iterable[Image.Image],
+        total_pages: Optional[int],
+        processed: int
+    ) -> int:
+        """Best-known page count without draining a lazy iterator"""
+        if total_pages is not None:
+            return total_pages
+        if hasattr(images, '__len__'):
+            return len(images)
+        return processed
+
+    def _batch_prompt(self, n: int) -> str:
+        """Get the cached n-page batch prompt"""
+        prompt = self._batch_prompts.get(n)
+        if prompt is None:
+            prompt = f"""Analyze these {n} document page(s). Return a JSON array of length {n}, one object per page in order:
+
+[{self.schema}]
+
+Be concise. JSON array only, no explanation."""
+            self._batch_prompts[n] = prompt
+        return prompt
+
+    async def _aextract_page_fast(self, image: Image.Image, page_num: int) -> Dict[str, Any]:
+        """Fast async extraction of a single page"""
+
+        key = self._page_key(image)
+        cached = self._cache_get(key)
+        if cached is not None:
+            logger.info(f"📄 Page {page_num}: cache hit")
+            cached['page'] = page_num
+            return cached
+
+        if self.adaptive_tokens:
+            # Decode is memory-bandwidth-bound, so start with a tight
+            # budget and a stop sequence; only a truncated reply pays
+            # for the full-budget retry
+            result = await self.qwen_client.aquery(
+                text=self._page_prompt,
+                images=[image],
+                max_tokens=min(300, self.max_tokens),
+                temperature=0.1,
+                stop=["\n\n\n"]
+            )
+
+            if result['success'] and result.get('finish_reason') == 'length':
+                logger.info(f"📄 Page {page_num}: truncated, retrying with full budget")
+                result = await self.qwen_client.aquery(
+                    text=self._page_prompt,
+                    images=[image],
+                    max_tokens=self.max_tokens,
+                    temperature=0.1
+                )
+        else:
+            result = await self.qwen_client.aquery(
+                text=self._page_prompt,
+                images=[image],
+                max_tokens=self.max_tokens,
+                temperature=0.1
+            )
 
-        result = self.qwen_client.query(
-            text=prompt,
-            images=[image],
-            max_tokens=500,  # Very low for speed
-            temperature=0.1
-        )
-        
         if result['success']:
             parsed = self._parse_json(result['content'])
             parsed['page'] = page_num
             parsed['success'] = True
+            self._cache_put(key, parsed)
             return parsed
         else:
             return {
@@ -75,18 +288,105 @@ Be concise. JSON only, no explanation."""
                 'type': 'unknown',
                 'confidence': 0.0
             }
+
+    def _extract_pages_batched(self, pages: List[Image.Image]) -> List[Dict[str, Any]]:
+        """Extract all cache-missing pages in one multi-image call"""
+
+        keys = [self._page_key(image) for image in pages]
+        hits = {i: self._cache_get(k) for i, k in enumerate(keys)}
+        misses = [i for i, cached in hits.items() if cached is None]
+
+        if not misses:
+            logger.info(f"📄 All {len(pages)} page(s) served from cache")
+            extractions = []
+            for i, cached in sorted(hits.items()):
+                cached['page'] = i + 1
+                extractions.append(cached)
+            return extractions
+
+        fresh = self._query_pages_batched([pages[i] for i in misses])
+
+        for i, extraction in zip(misses, fresh):
+            if extraction.get('success'):
+                self._cache_put(keys[i], extraction)
+            hits[i] = extraction
+
+        extractions = []
+        for i, extraction in sorted(hits.items()):
+            extraction['page'] = i + 1
+            extractions.append(extraction)
+        return extractions
+
+    def _query_pages_batched(self, pages: List[Image.Image]) -> List[Dict[str, Any]]:
+        """Run one multi-image request for the given pages"""
+
+        n = len(pages)
+
+        # One object per attached page image
+        result = self.qwen_client.query(
+            text=self._batch_prompt(n),
+            images=pages,
+            max_tokens=self.max_tokens * n,  # Very low per page for speed
+            temperature=0.1
+        )
+
+        if not result['success']:
+            return [
+                {
+                    'page': i,
+                    'success': False,
+                    'error': result.get('error', 'Unknown error'),
+                    'type': 'unknown',
+                    'confidence': 0.0
+                }
+                for i in range(1, n + 1)
+            ]
+
+        per_page = self._parse_json_array(result['content'], n)
+
+        extractions = []
+        for i, parsed in enumerate(per_page, 1):
+            parsed['page'] = i
+            parsed['success'] = True
+            extractions.append(parsed)
+        return extractions
+
+    def _parse_json_array(self, response: str, expected: int) -> List[Dict[str, Any]]:
+        """Split the model's JSON array into per-page dicts"""
+        try:
+            # Clean response
+            response = _THINK_RE.sub('', response)
+            response = _FENCE_RE.sub('', response)
+
+            match = _ARRAY_RE.search(response)
+            if match:
+                items = _loads(match.group(0))
+                if isinstance(items, list):
+                    pages = [item for item in items if isinstance(item, dict)]
+                    # Pad if the model returned fewer objects than pages
+                    while len(pages) < expected:
+                        pages.append({'type': 'document', 'confidence': 0.5})
+                    return pages[:expected]
+        except Exception as e:
+            logger.warning(f"JSON array parse failed: {e}")
+
+        # Fallback: maybe a single object came back
+        single = self._parse_json(response)
+        return [single] + [
+            {'type': 'document', 'confidence': 0.5} for _ in range(expected - 1)
+        ]
     
     def _parse_json(self, response: str) -> Dict[str, Any]:
         """Quick JSON parse"""
         try:
             # Clean response
-            response = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL)
-            response = re.sub(r'```json\s*|\s*```', '', response)
-            
+            response = _THINK_RE.sub('', response)
+            response = _FENCE_RE.sub('', response)
+
             # Extract JSON
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
+            candidate = _find_json(response)
+            if candidate:
+                return _loads(candidate)
             
             # Fallback
             return {
@@ -124,29 +424,44 @@ Be concise. JSON only, no explanation."""
                 'pages': extractions
             },
             'status': 'success',
-            'note': 'Fast mode - first 3 pages only' if total_pages > 3 else 'Fast mode'
+            'note': (
+                f'Fast mode - first {self.max_pages} pages only'
+                if self.max_pages is not None and total_pages > self.max_pages
+                else 'Fast mode'
+            )
         }
 
 
+@functools.lru_cache(maxsize=None)
+def _test_image() -> Image.Image:
+    """Build the test invoice once per process
+
+    Font loading and glyph rasterization would otherwise pollute
+    repeated benchmark runs.
+    """
+    from PIL import ImageDraw
+
+    img = Image.new('RGB', (400, 300), color='white')
+    draw = ImageDraw.Draw(img)
+    draw.text((20, 20), "INVOICE #123", fill='black')
+    draw.text((20, 50), "Total: $500", fill='black')
+    return img
+
+
 def test_fast():
     """Test fast processor"""
     print("=" * 70)
     print("Testing FAST Processor")
     print("=" * 70)
-    
+
     from models.qwen_client import Qwen3VLClient
-    from PIL import ImageDraw
     import time
-    
+
     client = Qwen3VLClient(timeout=120)
     processor = FastDocumentProcessor(client)
-    
-    # Simple test
-    img = Image.new('RGB', (400, 300), color='white')
-    draw = ImageDraw.Draw(img)
-    draw.text((20, 20), "INVOICE #123", fill='black')
-    draw.text((20, 50), "Total: $500", fill='black')
-    
+
+    img = _test_image()
+
     start = time.time()
     result = processor.process_document([img])
     elapsed = time.time() - start
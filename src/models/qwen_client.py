@@ -2,8 +2,20 @@
 Qwen3-VL-4B Client for LM Studio
 Handles multi-modal (text + image) requests
 """
-import base64
-import requests
+import asyncio
+import functools
+import mimetypes
+import httpx
+
+try:
+    import pybase64 as base64  # AVX2-vectorized, ~4x stdlib on MB-sized buffers
+except ImportError:
+    import base64
+
+try:
+    import orjson  # SIMD-accelerated C parser
+except ImportError:
+    orjson = None
 from typing import List, Dict, Any, Optional, Union
 from pathlib import Path
 from PIL import Image
@@ -25,37 +37,160 @@ class Qwen3VLClient:
         self,
         base_url: str = "http://localhost:1234/v1",
         model_name: str = "qwen3vl-4b",
-        timeout: int = 240
+        timeout: int = 240,
+        max_side: int = 1280,
+        debug: bool = False
     ):
         self.base_url = base_url
         self.model_name = model_name
         self.timeout = timeout
-        self.session = requests.Session()
-        
+        # Keep the full server reply only when debugging - it echoes
+        # the entire base64 payload and parsing/retaining it is costly
+        self.debug = debug
+        # Longest image side sent to the model - vision tokens scale
+        # with pixel area, so this caps encode time AND prefill cost
+        self.max_side = max_side
+        # HTTP/2 lets concurrent page requests multiplex over one TCP
+        # connection instead of head-of-line blocking on HTTP/1.1.
+        # http2/limits must be set on the transport itself: httpx uses
+        # an explicitly supplied transport as-is and silently ignores
+        # the client-level kwargs
+        self.session = httpx.Client(
+            timeout=timeout,
+            transport=httpx.HTTPTransport(
+                retries=1,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=8)
+            )
+        )
+        # Async counterpart is created lazily in _async_session so it
+        # binds to the running event loop on first use
+        self._asession: Optional[httpx.AsyncClient] = None
+        self._asession_loop: Optional[asyncio.AbstractEventLoop] = None
+
         logger.info(f"Initialized Qwen3VL Client: {base_url}")
-    
-    def _image_to_base64(self, image_input: Union[str, Path, Image.Image]) -> str:
-        """Convert image to base64 string"""
+
+    def _async_session(self) -> httpx.AsyncClient:
+        """Shared AsyncClient for aquery - concurrent page requests
+        multiplex over one persistent HTTP/2 connection instead of
+        each paying its own TCP/TLS setup
+
+        Rebuilt whenever the running loop changes: pooled connections
+        belong to the loop they were opened on, and reusing them after
+        asyncio.run() tears that loop down fails every request.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._asession is None
+            or self._asession.is_closed
+            or self._asession_loop is not loop
+        ):
+            self._asession_loop = loop
+            self._asession = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=httpx.AsyncHTTPTransport(
+                    retries=1,
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=8)
+                )
+            )
+        return self._asession
+
+    async def aclose(self) -> None:
+        """Close the shared async connection pool"""
+        if self._asession is not None and not self._asession.is_closed:
+            await self._asession.aclose()
+
+
+    def _image_to_data_url(self, image_input: Union[str, Path, Image.Image]) -> str:
+        """Convert image to a base64 data URL"""
         try:
             if isinstance(image_input, (str, Path)):
-                # Load from file
-                with open(image_input, 'rb') as f:
+                path = Path(image_input)
+
+                # Peek at the header only - re-encode just oversize files
+                with Image.open(path) as probe:
+                    oversize = max(probe.size) > self.max_side
+                    if oversize:
+                        probe.load()
+                        return self._encode_pil(probe)
+
+                # Pass bytes through without re-encoding
+                with open(path, 'rb') as f:
                     img_bytes = f.read()
-                return base64.b64encode(img_bytes).decode('utf-8')
-            
+                mime = mimetypes.guess_type(path.name)[0] or 'image/png'
+                b64 = base64.b64encode(img_bytes).decode('utf-8')
+                return f"data:{mime};base64,{b64}"
+
             elif isinstance(image_input, Image.Image):
-                # Convert PIL Image to base64
-                buffered = io.BytesIO()
-                image_input.save(buffered, format="PNG")
-                return base64.b64encode(buffered.getvalue()).decode('utf-8')
-            
+                return self._encode_pil(image_input)
+
             else:
                 raise ValueError(f"Unsupported image input type: {type(image_input)}")
-        
+
         except Exception as e:
             logger.error(f"Failed to convert image to base64: {e}")
             raise
+
+    def _encode_pil(self, image: Image.Image) -> str:
+        """Downscale and JPEG-encode a PIL image into a data URL
+
+        JPEG q85 instead of PNG: libjpeg-turbo's SIMD encode is far
+        cheaper than zlib deflate and the payload is ~5-10x smaller on
+        the wire.
+        """
+        img = image
+        if max(img.size) > self.max_side:
+            img = img.copy()
+            img.thumbnail((self.max_side, self.max_side), Image.BILINEAR)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        buffered = io.BytesIO()
+        img.save(buffered, format="JPEG", quality=85, optimize=False)
+        b64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
+        return f"data:image/jpeg;base64,{b64}"
     
+    def _build_payload(
+        self,
+        text: str,
+        images: Optional[List[Union[str, Path, Image.Image]]],
+        max_tokens: int,
+        temperature: float,
+        stream: bool,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build a chat-completions payload with optional images"""
+        # Build message content
+        content = [{"type": "text", "text": text}]
+
+        # Add images if provided
+        if images:
+            for img in images:
+                content.append({
+                    "type": "image_url",
+                    "image_url": {
+                        "url": self._image_to_data_url(img)
+                    }
+                })
+
+        payload = {
+            "model": self.model_name,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": content
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": stream,
+            **kwargs
+        }
+        if payload.get("stop") is None:
+            payload.pop("stop", None)
+        return payload
+
     def query(
         self,
         text: str,
@@ -79,35 +214,10 @@ class Qwen3VLClient:
             Dict with response and metadata
         """
         try:
-            # Build message content
-            content = [{"type": "text", "text": text}]
-            
-            # Add images if provided
-            if images:
-                for img in images:
-                    img_b64 = self._image_to_base64(img)
-                    content.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{img_b64}"
-                        }
-                    })
-            
-            # Make API request
-            payload = {
-                "model": self.model_name,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": content
-                    }
-                ],
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "stream": stream,
-                **kwargs
-            }
-            
+            payload = self._build_payload(
+                text, images, max_tokens, temperature, stream, **kwargs
+            )
+
             logger.debug(f"Sending request with {len(images) if images else 0} images")
             
             response = self.session.post(
@@ -116,37 +226,20 @@ class Qwen3VLClient:
                 timeout=self.timeout
             )
             response.raise_for_status()
-            
-            result = response.json()
-            
-            # Extract response
-            if 'choices' in result and len(result['choices']) > 0:
-                content = result['choices'][0]['message']['content']
-                
-                return {
-                    "success": True,
-                    "content": content,
-                    "model": result.get('model', self.model_name),
-                    "usage": result.get('usage', {}),
-                    "raw_response": result
-                }
-            else:
-                logger.error(f"Unexpected response format: {result}")
-                return {
-                    "success": False,
-                    "content": "",
-                    "error": "Unexpected response format"
-                }
-        
-        except requests.exceptions.Timeout:
+
+            result = orjson.loads(response.content) if orjson else response.json()
+
+            return self._extract_result(result)
+
+        except httpx.TimeoutException:
             logger.error(f"Request timeout after {self.timeout}s")
             return {
                 "success": False,
                 "content": "",
                 "error": "Request timeout"
             }
-        
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             logger.error(f"Request failed: {e}")
             return {
                 "success": False,
@@ -161,7 +254,93 @@ class Qwen3VLClient:
                 "content": "",
                 "error": str(e)
             }
-    
+
+    async def aquery(
+        self,
+        text: str,
+        images: Optional[List[Union[str, Path, Image.Image]]] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.1,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async version of query() for concurrent per-page requests
+
+        Overlaps HTTP waits so the server's continuous batcher can
+        coalesce simultaneous page requests into one prefill batch.
+
+        Args:
+            text: Text prompt/question
+            images: List of images (file paths or PIL Images)
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+
+        Returns:
+            Dict with response and metadata
+        """
+        try:
+            payload = self._build_payload(
+                text, images, max_tokens, temperature, False, **kwargs
+            )
+
+            logger.debug(f"Sending async request with {len(images) if images else 0} images")
+
+            session = self._async_session()
+            response = await session.post(
+                f"{self.base_url}/chat/completions",
+                json=payload
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content) if orjson else response.json()
+
+            return self._extract_result(result)
+
+        except httpx.TimeoutException:
+            logger.error(f"Async request timeout after {self.timeout}s")
+            return {
+                "success": False,
+                "content": "",
+                "error": "Request timeout"
+            }
+
+        except httpx.HTTPError as e:
+            logger.error(f"Async request failed: {e}")
+            return {
+                "success": False,
+                "content": "",
+                "error": str(e)
+            }
+
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return {
+                "success": False,
+                "content": "",
+                "error": str(e)
+            }
+
+    def _extract_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the completion from a chat-completions response"""
+        if 'choices' in result and len(result['choices']) > 0:
+            choice = result['choices'][0]
+            content = choice['message']['content']
+
+            return {
+                "success": True,
+                "content": content,
+                "model": result.get('model', self.model_name),
+                "usage": result.get('usage', {}),
+                "finish_reason": choice.get('finish_reason'),
+                "raw_response": result if self.debug else None
+            }
+        else:
+            logger.error(f"Unexpected response format: {result}")
+            return {
+                "success": False,
+                "content": "",
+                "error": "Unexpected response format"
+            }
+
     def test_connection(self) -> bool:
         """Test if LM Studio is accessible"""
         try:
@@ -189,6 +368,12 @@ class Qwen3VLClient:
 
 
 # Test function
+@functools.lru_cache(maxsize=None)
+def _test_image() -> Image.Image:
+    """Build the multi-modal test image once per process"""
+    return Image.new('RGB', (200, 200), color='red')
+
+
 def test_qwen_client():
     """Test the Qwen3-VL client"""
     print("=" * 70)
@@ -226,9 +411,9 @@ def test_qwen_client():
     # Test 4: Multi-modal query
     print("\n[4/4] Testing multi-modal query...")
     try:
-        # Create a test image (red square)
-        test_img = Image.new('RGB', (200, 200), color='red')
-        
+        # Test image (red square), cached across runs
+        test_img = _test_image()
+
         result = client.query(
             "What color is this image? Answer in one word.",
             images=[test_img],
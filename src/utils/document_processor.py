@@ -3,12 +3,14 @@ Document Processing Utilities
 Handles PDF, images, and document conversions
 """
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional, Union
+from typing import Iterator, List, Tuple, Optional, Union
 from PIL import Image
 import PyPDF2
 import pdfplumber
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,7 +49,10 @@ class DocumentProcessor:
             images = convert_from_path(
                 pdf_path,
                 dpi=self.dpi,
-                poppler_path=self.poppler_path
+                poppler_path=self.poppler_path,
+                # pdf2image shards the page range across this many
+                # poppler processes - rasterization is embarrassingly parallel
+                thread_count=min(4, os.cpu_count() or 1)
             )
             
             logger.info(f"Converted {len(images)} pages")
@@ -57,6 +62,44 @@ class DocumentProcessor:
             logger.error(f"Failed to convert PDF: {e}")
             raise
     
+    def pdf_page_count(self, pdf_path: Union[str, Path]) -> int:
+        """Get the page count without rendering anything"""
+        info = pdfinfo_from_path(
+            Path(pdf_path),
+            poppler_path=self.poppler_path
+        )
+        return int(info['Pages'])
+
+    def iter_pdf_pages(self, pdf_path: Union[str, Path]) -> Iterator[Image.Image]:
+        """Yield PDF pages as poppler finishes rendering them
+
+        Streams pages through a small prefetch window so the consumer
+        (model inference) overlaps with rasterization of later pages -
+        total time becomes max(raster, inference) instead of the sum.
+        """
+        pdf_path = Path(pdf_path)
+        total = self.pdf_page_count(pdf_path)
+        logger.info(f"Streaming {total} page(s) from {pdf_path.name}")
+
+        def _render(page_num: int) -> Image.Image:
+            return convert_from_path(
+                pdf_path,
+                dpi=self.dpi,
+                poppler_path=self.poppler_path,
+                first_page=page_num,
+                last_page=page_num
+            )[0]
+
+        window = 2  # pages rendered ahead of the consumer
+        with ThreadPoolExecutor(max_workers=window) as pool:
+            pending = deque()
+            next_page = 1
+            while next_page <= total or pending:
+                while next_page <= total and len(pending) < window:
+                    pending.append(pool.submit(_render, next_page))
+                    next_page += 1
+                yield pending.popleft().result()
+
     def extract_text_pdfplumber(self, pdf_path: Union[str, Path]) -> List[str]:
         """Extract text from PDF using pdfplumber"""
         try:
@@ -80,10 +123,15 @@ class DocumentProcessor:
         try:
             image_path = Path(image_path)
             img = Image.open(image_path)
-            
+
+            if img.format == 'JPEG':
+                # libjpeg decodes straight into RGB - no post-hoc
+                # convert() allocation/copy needed
+                img.draft('RGB', img.size)
+                img.load()
             if img.mode != 'RGB':
                 img = img.convert('RGB')
-            
+
             logger.debug(f"Loaded image: {image_path.name} ({img.size})")
             return img
             
@@ -93,19 +141,24 @@ class DocumentProcessor:
     
     def process_document(
         self,
-        file_path: Union[str, Path]
+        file_path: Union[str, Path],
+        extract_text: bool = False
     ) -> Tuple[List[Image.Image], List[str]]:
-        """Process document into images and text"""
+        """Process document into images and (optionally) text
+
+        pdfplumber parses every content stream in pure Python, so the
+        text pass is skipped unless the caller actually wants it.
+        """
         file_path = Path(file_path)
-        
+
         if not self.is_supported(file_path):
             raise ValueError(f"Unsupported file type: {file_path.suffix}")
-        
+
         logger.info(f"Processing document: {file_path.name}")
-        
+
         if file_path.suffix.lower() == '.pdf':
             images = self.pdf_to_images(file_path)
-            texts = self.extract_text_pdfplumber(file_path)
+            texts = self.extract_text_pdfplumber(file_path) if extract_text else []
             return images, texts
         else:
             img = self.load_image(file_path)